@@ -1,24 +1,36 @@
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
+from perf import timed
+from feature_kernels import FEATURE_BACKENDS, lag_rolling_features
 
 class LinearRegressionForecaster:
-    def __init__(self, lags=[1, 24, 168]):
+    def __init__(self, lags=[1, 24, 168], feature_backend="pandas"):
+        if feature_backend not in FEATURE_BACKENDS:
+            raise ValueError(f"feature_backend must be one of {FEATURE_BACKENDS}.")
         self.lags = lags
+        self.feature_backend = feature_backend
         self.model = None
         self.feature_names = []
 
+    @timed("linreg.create_features")
     def create_features(self, df, target_code):
         # Assumes df is indexed by datetime, columns are codes
         df_feat = df[[target_code]].copy()
-        for lag in self.lags:
-            df_feat[f"lag_{lag}"] = df_feat[target_code].shift(lag)
+        if self.feature_backend != "pandas":
+            values = lag_rolling_features(df_feat[target_code].to_numpy(), self.lags, backend=self.feature_backend)
+            lag_df = pd.DataFrame(values, index=df_feat.index, columns=[f"lag_{lag}" for lag in self.lags])
+            df_feat = pd.concat([df_feat, lag_df], axis=1)
+        else:
+            for lag in self.lags:
+                df_feat[f"lag_{lag}"] = df_feat[target_code].shift(lag)
         df_feat["hour"] = df_feat.index.hour
         df_feat["dayofweek"] = df_feat.index.dayofweek
         df_feat["month"] = df_feat.index.month
         df_feat = df_feat.dropna()  # Drop rows with NaNs caused by shifting
         return df_feat
 
+    @timed("linreg.train")
     def train(self, df, target_code, forecast_start):
         df_feat = self.create_features(df, target_code)
         forecast_start = pd.to_datetime(forecast_start)
@@ -35,6 +47,7 @@ class LinearRegressionForecaster:
         self.model = LinearRegression()
         self.model.fit(X, y)
 
+    @timed("linreg.predict")
     def predict(self, df, target_code):
         df_feat = self.create_features(df, target_code)
         X = df_feat[self.feature_names]
@@ -43,6 +56,7 @@ class LinearRegressionForecaster:
         result["prediction"] = preds
         return result
 
+    @timed("linreg.forecast")
     def forecast(self, df, target_code, forecast_start, forecast_end):
         """
         Forecast values from forecast_start to forecast_end (inclusive).
@@ -2,6 +2,7 @@ from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
 import logging
 import pandas as pd
+from perf import span, timed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -70,7 +71,7 @@ class GraphQLClient:
         
         try:
             # Execute the query safely using a context manager
-            with Client(transport=self.transport, fetch_schema_from_transport=False) as session_client:
+            with span("gql.fetch_time_series"), Client(transport=self.transport, fetch_schema_from_transport=False) as session_client:
                 response = session_client.execute(query, variable_values=params)
             return response
         except Exception as e:
@@ -78,6 +79,7 @@ class GraphQLClient:
             return None
 
 
+    @timed("gql.to_dataframe")
     def to_dataframe(self, data):
         """
         Convert fetched time series data into a pandas DataFrame.
@@ -117,7 +119,7 @@ class GraphQLClient:
         """
         try:
             query = gql(query_string)
-            with Client(transport=self.transport, fetch_schema_from_transport=False) as session_client:
+            with span("gql.execute_query"), Client(transport=self.transport, fetch_schema_from_transport=False) as session_client:
                 response = session_client.execute(query, variable_values=variables)
             return response
         except Exception as e:
@@ -5,27 +5,39 @@ import plotly.graph_objects as go
 import streamlit as st
 from sklearn.metrics import mean_absolute_error
 from sklearn.model_selection import train_test_split
+from perf import span, timed
+from feature_kernels import FEATURE_BACKENDS, lag_rolling_features
 
 class LightGBMQuantileForecaster:
-    def __init__(self, quantiles=[0.1, 0.5, 0.9], lags=[1, 24, 168]):
+    def __init__(self, quantiles=[0.1, 0.5, 0.9], lags=[1, 24, 168], feature_backend="pandas"):
+        if feature_backend not in FEATURE_BACKENDS:
+            raise ValueError(f"feature_backend must be one of {FEATURE_BACKENDS}.")
         self.quantiles = quantiles
         self.lags = lags
+        self.feature_backend = feature_backend
         self.models = {}
         self.features = []
         self.target = None
 
+    @timed("lgb.create_features")
     def create_features(self, df, target_code):
         df = df[[target_code]].copy()
         df['hour'] = df.index.hour
         df['dayofweek'] = df.index.dayofweek
         df['month'] = df.index.month
         df['is_weekend'] = df['dayofweek'].isin([5, 6]).astype(int)
+        if self.feature_backend != "pandas":
+            # All lag and rolling columns in one float32 buffer, no intermediate Series
+            values = lag_rolling_features(df[target_code].to_numpy(), self.lags, window=24, backend=self.feature_backend)
+            columns = [f'lag_{lag}' for lag in self.lags] + ['rolling_mean_24', 'rolling_std_24']
+            return pd.concat([df, pd.DataFrame(values, index=df.index, columns=columns)], axis=1)
         for lag in self.lags:
             df[f'lag_{lag}'] = df[target_code].shift(lag)
         df['rolling_mean_24'] = df[target_code].shift(1).rolling(window=24).mean()
         df['rolling_std_24'] = df[target_code].shift(1).rolling(window=24).std()
         return df
 
+    @timed("lgb.fit")
     def fit(self, df, target_code, forecast_start):
 
         self.target = target_code
@@ -47,43 +59,46 @@ class LightGBMQuantileForecaster:
             X_train, X_val, y_train, y_val = train_test_split(
                 train[self.features], train[target_code], test_size=0.2, random_state=42
             )
-            for num_leaves in param_grid["num_leaves"]:
-                for lr in param_grid["learning_rate"]:
-                    for min_data in param_grid["min_data_in_leaf"]:
-                        params = {
-                            "objective": "quantile",
-                            "metric": "quantile",
-                            "alpha": q,
-                            "boosting_type": "gbdt",
-                            "learning_rate": lr,
-                            "num_leaves": num_leaves,
-                            "min_data_in_leaf": min_data,
-                            "verbose": -1
-                        }
-                        lgb_train = lgb.Dataset(X_train, label=y_train)
-                        lgb_val = lgb.Dataset(X_val, label=y_val, reference=lgb_train)
-                        model = lgb.train(
-                            params,
-                            lgb_train,
-                            num_boost_round=200,
-                            valid_sets=[lgb_val]
-                        )
-                        preds = model.predict(X_val)
-                        mae = mean_absolute_error(y_val, preds)
-                        if mae < best_mae:
-                            best_mae = mae
-                            best_params = params.copy()
-                            best_model = model
+            with span("lgb.grid_search"):
+                for num_leaves in param_grid["num_leaves"]:
+                    for lr in param_grid["learning_rate"]:
+                        for min_data in param_grid["min_data_in_leaf"]:
+                            params = {
+                                "objective": "quantile",
+                                "metric": "quantile",
+                                "alpha": q,
+                                "boosting_type": "gbdt",
+                                "learning_rate": lr,
+                                "num_leaves": num_leaves,
+                                "min_data_in_leaf": min_data,
+                                "verbose": -1
+                            }
+                            lgb_train = lgb.Dataset(X_train, label=y_train)
+                            lgb_val = lgb.Dataset(X_val, label=y_val, reference=lgb_train)
+                            model = lgb.train(
+                                params,
+                                lgb_train,
+                                num_boost_round=200,
+                                valid_sets=[lgb_val]
+                            )
+                            preds = model.predict(X_val)
+                            mae = mean_absolute_error(y_val, preds)
+                            if mae < best_mae:
+                                best_mae = mae
+                                best_params = params.copy()
+                                best_model = model
 
             # Retrain on full train set with best params
-            lgb_train_full = lgb.Dataset(train[self.features], label=train[target_code])
-            final_model = lgb.train(
-                best_params,
-                lgb_train_full,
-                num_boost_round=best_model.best_iteration or 200
-            )
+            with span("lgb.refit"):
+                lgb_train_full = lgb.Dataset(train[self.features], label=train[target_code])
+                final_model = lgb.train(
+                    best_params,
+                    lgb_train_full,
+                    num_boost_round=best_model.best_iteration or 200
+                )
             self.models[q] = final_model
 
+    @timed("lgb.predict")
     def predict(self, df, target_code):
         df_feat = self.create_features(df, target_code)
         df_feat = df_feat.dropna()
@@ -91,6 +106,7 @@ class LightGBMQuantileForecaster:
             df_feat[f"forecast_p{int(q*100)}"] = self.models[q].predict(df_feat[self.features])
         return df_feat
 
+    @timed("lgb.plot_forecast_plotly")
     def plot_forecast_plotly(self, df, target_col, quantiles):
         low_q, median_q, high_q = quantiles
         lower = f'forecast_p{int(low_q * 100):02d}'
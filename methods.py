@@ -1,5 +1,6 @@
 import pandas as pd
 import logging
+from perf import timed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +21,7 @@ class Methods:
         self.data = data
 
 
+    @timed("methods.nan_handling")
     def nan_handling(self, method='forward-fill'):
         """
         Handles NaN values in numerical columns based on the specified method.
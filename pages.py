@@ -4,7 +4,9 @@ from methods import Methods
 from datetime import datetime, timedelta
 import pytz
 import tzlocal
-from lgb_forecast import LightGBMQuantileForecaster 
+from perf import recorder, span
+from warmup import load, import_report
+from feature_kernels import available_backends
 
 def time_series_viewer():
     st.title("Time Series Viewer")
@@ -52,7 +54,8 @@ def time_series_viewer():
                         if df_line_chart.dropna(how="all").empty:
                             st.warning("Selected columns contain only NaN values.")
                         else:
-                            st.line_chart(df_line_chart, height=400, use_container_width=True)
+                            with span("pages.line_chart"):
+                                st.line_chart(df_line_chart, height=400, use_container_width=True)
                     else:
                         st.warning("Please select at least one numeric column.")
 
@@ -69,6 +72,9 @@ def forecasting_page():
         else:
             st.write("Please select which time series you would like to forecast.")
             target_column = st.selectbox("Select Time Series", df.columns.tolist())
+            feature_backend = st.selectbox("Feature Backend", available_backends(),
+                                           help="numpy lowers memory use on long histories but is slower than pandas; "
+                                                "numba is the fast, low-memory backend.")
             
             # Let user pick forecast start date
             min_date = df.index.min()
@@ -113,20 +119,25 @@ def forecasting_page():
                     forecast_end_dt = forecast_end_dt.tz_convert(df.index.tz)
 
             if st.button("Run Forecast"):
-                forecaster = LightGBMQuantileForecaster()
+                # LightGBM, scikit-learn and Plotly are only loaded once a forecast is requested
+                with st.spinner("Loading forecasting libraries..."):
+                    lgb_forecast = load("lgb_forecast")
+                forecaster = lgb_forecast.LightGBMQuantileForecaster(feature_backend=feature_backend)
                 try:
                     # Train on all available data up to forecast_start_dt
                     forecaster.fit(df, target_column, forecast_start_dt)
                     # Predict for the entire DataFrame (including future, if appended)
-                    df_pred = forecaster.create_features(df, target_column)
-                    df_pred = df_pred.dropna()
-                    for q in forecaster.quantiles:
-                        df_pred[f"forecast_p{int(q*100)}"] = forecaster.models[q].predict(df_pred[forecaster.features])
+                    with span("pages.forecast_predict"):
+                        df_pred = forecaster.create_features(df, target_column)
+                        df_pred = df_pred.dropna()
+                        for q in forecaster.quantiles:
+                            df_pred[f"forecast_p{int(q*100)}"] = forecaster.models[q].predict(df_pred[forecaster.features])
                     # Show only the forecast period
                     forecast_df = df_pred[df_pred.index >= forecast_start_dt]
                     st.success("Forecast completed!")
                     fig = forecaster.plot_forecast_plotly(forecast_df, target_column, forecaster.quantiles)
-                    st.plotly_chart(fig, use_container_width=True)
+                    with span("pages.plotly_chart"):
+                        st.plotly_chart(fig, use_container_width=True)
                     st.dataframe(forecast_df)
                 except Exception as e:
                     st.error(f"Forecasting failed: {e}")
@@ -170,3 +181,53 @@ def sidebar_query_params():
         "end_iso": end_iso,
         "fetch": fetch
     }
+
+def performance_toggle():
+    # Must run before the tabs render so the rerun triggered by the checkbox is timed
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("Performance")
+    if recorder.enabled:
+        st.sidebar.checkbox("Record stage timings", value=True, disabled=True,
+                            help="Enabled for all sessions by WEB_APP_PERF=1.")
+    else:
+        st.sidebar.checkbox("Record stage timings", key="perf_enabled")
+    recorder.enable_for_thread(st.session_state.get("perf_enabled", False))
+
+def performance_panel():
+    if not recorder.active:
+        return
+
+    imports = import_report()
+    if imports:
+        with st.sidebar.expander("Import times"):
+            st.caption("Waited: time the first request blocked on the import. "
+                       "Warm-up: incremental background time, excluding modules imported before it.")
+            for module_name, times in imports.items():
+                parts = [f"{label} {times[key] * 1000:.0f} ms"
+                         for key, label in (("waited", "waited"), ("warmup", "warm-up")) if times[key] is not None]
+                st.text(f"{module_name}: {', '.join(parts)}")
+
+    stats = recorder.snapshot()
+    if not stats:
+        st.sidebar.caption("No timings recorded yet.")
+        return
+
+    # One row per stage, latencies in milliseconds
+    table = pd.DataFrame([
+        {
+            "stage": name,
+            "count": h["count"],
+            "p50 (ms)": h["p50"] * 1000,
+            "p95 (ms)": h["p95"] * 1000,
+            "max (ms)": h["max"] * 1000
+        }
+        for name, h in stats.items()
+    ]).set_index("stage")
+    st.sidebar.dataframe(table.round(1), use_container_width=True)
+
+    st.sidebar.download_button("Export JSON", recorder.to_json(), file_name="timings.json", mime="application/json")
+    st.sidebar.download_button("Export Prometheus", recorder.to_prometheus(), file_name="timings.prom", mime="text/plain")
+    # The histograms are shared by every session, so only the WEB_APP_PERF=1 operator may clear them
+    if recorder.enabled:
+        st.sidebar.button("Reset Timings (all sessions)", on_click=recorder.reset,
+                          help="Clears the shared histograms, including what the Prometheus export reports.")
@@ -0,0 +1,213 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class StageHistogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Cumulative latency histogram for a single stage.
+
+        Args:
+            buckets (tuple): Sorted bucket upper bounds in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside the matching bucket.
+
+        Args:
+            q (float): Quantile in [0, 1].
+        Returns:
+            float: Estimated latency in seconds, or None if nothing was observed.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if bucket_count and seen + bucket_count >= rank:
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            seen += bucket_count
+            lower = upper
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {str(b): c for b, c in zip(self.buckets + ("+Inf",), self.counts)}
+        }
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class PerfRecorder:
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Collects timing spans into per-stage latency histograms.
+
+        When disabled, spans are a shared no-op context manager so the
+        instrumented code only pays for two attribute lookups.
+
+        Args:
+            enabled (bool): Whether spans are recorded in every thread.
+            buckets (tuple): Histogram bucket upper bounds in seconds.
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def active(self):
+        """
+        Whether spans are recorded in the calling thread.
+        """
+        return self.enabled or getattr(self._local, "enabled", False)
+
+    def enable_for_thread(self, enabled):
+        """
+        Turn recording on or off for the calling thread only.
+
+        Streamlit runs each session's script in its own thread, so this
+        scopes a per-session toggle without affecting other sessions.
+
+        Args:
+            enabled (bool): Whether to record spans in this thread.
+        """
+        self._local.enabled = enabled
+
+    def span(self, name):
+        """
+        Time a block of code under the given stage name.
+
+        Usage:
+            with recorder.span("gql.fetch_time_series"):
+                ...
+        """
+        if not self.active:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name):
+        """
+        Decorator that wraps every call of a function in a span.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.active:
+                    return func(*args, **kwargs)
+                with _Span(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._stages.get(name)
+            if hist is None:
+                hist = self._stages[name] = StageHistogram(self.buckets)
+            hist.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Stage name -> histogram summary, sorted by stage name.
+        """
+        with self._lock:
+            return {name: self._stages[name].to_dict() for name in sorted(self._stages)}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, metric="web_app_stage_duration_seconds"):
+        """
+        Render all histograms in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {metric} Duration of instrumented web app stages.",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            for name in sorted(self._stages):
+                hist = self._stages[name]
+                cumulative = 0
+                for bound, bucket_count in zip(hist.buckets + ("+Inf",), hist.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {hist.total}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide recorder; enable for all sessions with WEB_APP_PERF=1, or per session from the sidebar
+recorder = PerfRecorder(enabled=os.environ.get("WEB_APP_PERF", "0") == "1")
+span = recorder.span
+timed = recorder.timed
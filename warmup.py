@@ -0,0 +1,131 @@
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from perf import span
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Modules that are only needed once the user fetches data or runs a forecast
+HEAVY_MODULES = (
+    "gql_client",
+    "sklearn.metrics",
+    "sklearn.model_selection",
+    "plotly.graph_objects",
+    "lightgbm",
+    "lgb_forecast"
+)
+
+# Seconds the first foreground load() of each module blocked the caller
+_wait_times = {}
+# Seconds the warm-up thread spent on each module, on top of the modules it imported before it
+_warmup_times = {}
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+
+def _timed_import(module_name):
+    start = time.perf_counter()
+    with span(f"import.{module_name}"):
+        module = importlib.import_module(module_name)
+    return module, time.perf_counter() - start
+
+
+def load(module_name):
+    """
+    Import a module on demand and remember how long the first call waited.
+
+    Always goes through importlib.import_module, which takes the per-module
+    import lock, so a module the warm-up thread is still executing is waited
+    for instead of being returned partially initialized.
+
+    Args:
+        module_name (str): Dotted module name.
+    Returns:
+        module: The imported module.
+    """
+    if module_name in _wait_times:
+        return importlib.import_module(module_name)
+
+    module, seconds = _timed_import(module_name)
+    _wait_times.setdefault(module_name, seconds)
+    return module
+
+
+def import_report():
+    """
+    Returns:
+        dict: Module name -> {"waited": seconds the first load() blocked for,
+            "warmup": incremental seconds spent in the warm-up thread}, with
+            None where a module was not loaded that way. Slowest first.
+    """
+    modules = set(_wait_times) | set(_warmup_times)
+    report = {name: {"waited": _wait_times.get(name), "warmup": _warmup_times.get(name)} for name in modules}
+    return dict(sorted(report.items(), key=lambda item: max(v or 0.0 for v in item[1].values()), reverse=True))
+
+
+def _warm_up(modules):
+    for module_name in modules:
+        try:
+            _, seconds = _timed_import(module_name)
+            _warmup_times.setdefault(module_name, seconds)
+        except Exception as e:
+            logger.error(f"Warm-up import of '{module_name}' failed: {e}")
+    logger.info(f"Warm-up finished: {_warmup_times}")
+
+
+def start_warmup(modules=HEAVY_MODULES):
+    """
+    Import the heavy modules once per process in a daemon thread, so the
+    first forecast does not pay for them. Disable with WEB_APP_WARMUP=0.
+
+    Returns:
+        threading.Thread: The warm-up thread, or None if disabled.
+    """
+    global _warmup_thread
+    if os.environ.get("WEB_APP_WARMUP", "1") == "0":
+        return None
+
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, args=(modules,), name="import-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def measure_cold_imports(modules, repeat=5):
+    """
+    Measure the cold import time of each module in fresh interpreters.
+
+    Args:
+        modules (iterable): Dotted module names.
+        repeat (int): Number of fresh interpreters per module.
+    Returns:
+        dict: Module name -> median import time in seconds.
+    """
+    code = "import time, importlib, sys; t = time.perf_counter(); importlib.import_module(sys.argv[1]); print(time.perf_counter() - t)"
+    results = {}
+    for module_name in modules:
+        samples = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", code, module_name], capture_output=True, text=True)
+            if out.returncode != 0:
+                logger.error(f"Importing '{module_name}' failed: {out.stderr.strip()}")
+                break
+            samples.append(float(out.stdout.strip().splitlines()[-1]))
+        if samples:
+            results[module_name] = sorted(samples)[len(samples) // 2]
+    return results
+
+
+# Import-time report
+if __name__ == "__main__":
+
+    modules = sys.argv[1:] or ("pages", "web_app") + HEAVY_MODULES
+    for module_name, seconds in measure_cold_imports(modules).items():
+        print(f"{module_name:<28} {seconds * 1000:8.1f} ms")
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
-from gql_client import GraphQLClient
-from pages import time_series_viewer, forecasting_page, sidebar_query_params
+from pages import time_series_viewer, forecasting_page, sidebar_query_params, performance_toggle, performance_panel
+from perf import span
+from warmup import load, start_warmup
 
 st.set_page_config(layout="wide")
 
@@ -12,17 +13,18 @@ def main():
     start_iso = params["start_iso"]
     end_iso = params["end_iso"]
     fetch = params["fetch"]
+    performance_toggle()
 
     if fetch:
         codes = [code.strip() for code in codes_input.split(",")]
 
-        client = GraphQLClient(
-            url="http://gtw.core-tst.aks.e21/graphql/",
-            schema="POWERNL",
-            api_key="3C0262DE-027E-48E8-B8BB-397B4CB54CF8"
-        )
-
         with st.spinner("Fetching data..."):
+            # Importing gql may still be pending on a cold worker, so keep it under the spinner
+            client = load("gql_client").GraphQLClient(
+                url="http://gtw.core-tst.aks.e21/graphql/",
+                schema="POWERNL",
+                api_key="3C0262DE-027E-48E8-B8BB-397B4CB54CF8"
+            )
             response = client.fetch_time_series(codes=codes, start_period=start_iso, end_period=end_iso)
             # st.write("API raw response:", response)  # Debug print
 
@@ -39,11 +41,16 @@ def main():
     
     tab1, tab2 = st.tabs(["Time Series Viewer", "Forecasting"])
     
-    with tab1:
+    with tab1, span("pages.time_series_viewer"):
         time_series_viewer()
     
-    with tab2:
+    with tab2, span("pages.forecasting_page"):
         forecasting_page()
 
+    performance_panel()
+
+    # Preload the forecasting stack in the background once the page is up
+    start_warmup()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file